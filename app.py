@@ -1,128 +1,560 @@
+import os
 import sys
 import re
-import argparse
-import requests
-from youtube_transcript_api import YouTubeTranscriptApi, TranscriptsDisabled, NoTranscriptFound
-from urllib.parse import urlparse
-
-# Compilar patrones una sola vez
-PATTERNS = [
-    re.compile(r'(?:v=|\/)([0-9A-Za-z_-]{11})(?:[\?&].*)?'),
-    re.compile(r'youtu\.be\/([0-9A-Za-z_-]{11})'),
-    re.compile(r'youtube\.com\/embed\/([0-9A-Za-z_-]{11})')
-]
+import html
+import json
+import time
+import atexit
+import threading
+import functools
+import operator
+from collections import namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, TimeoutError as FutureTimeoutError
+from urllib.parse import urlparse, parse_qs
 
+# CLI exit codes
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_USAGE = 2
+
+@functools.cache
+def _id_patterns():
+    """Compile the video ID patterns once, on first use.
+
+    Returns the ``(video_id_re, valid_id_re)`` pair; code paths such as
+    ``--help`` never pay for the compilation.
+    """
+    video_id_re = re.compile(
+        r'(?:v=|youtu\.be/|/(?:embed/|shorts/|live/|v/|e/)?)([0-9A-Za-z_-]{11})(?:[?&#/]|$)'
+    )
+    valid_id_re = re.compile(r'[0-9A-Za-z_-]{11}')
+    return video_id_re, valid_id_re
+
+# Path prefixes that place the ID at a fixed offset
+ID_PATH_MARKERS = ('youtu.be/', '/embed/', '/shorts/', '/live/', '/v/', '/e/')
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session():
+    """
+    Return the shared HTTP session, creating it on first use.
+    Connections are kept alive and pooled (sized for batch downloads plus
+    the hedged title requests), and connection failures and transient
+    server errors are retried with a short backoff. requests already negotiates gzip/deflate by default.
+    requests is imported here so start-up (and the GUI's first paint)
+    doesn't pay for it.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            session = requests.Session()
+            # 429 is not retried: hammering a rate-limited IP only makes it
+            # worse. raise_on_status=False hands the final response back
+            # instead of a RetryError, so youtube_transcript_api can still
+            # report it as YouTubeRequestFailed/IpBlocked. read=False: a read
+            # timeout is paid once, not once per retry
+            retry = Retry(total=3, read=False, backoff_factor=0.3,
+                          status_forcelist=(500, 502, 503, 504), raise_on_status=False)
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=retry)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            atexit.register(session.close)
+            _session = session
+        return _session
+
+OEMBED_URL_TEMPLATE = "https://www.youtube.com/oembed?url=https://www.youtube.com/watch?v={}&format=json"
+WATCH_URL_TEMPLATE = "https://www.youtube.com/watch?v={}"
+TITLE_HEDGE_DELAY = 0.5  # seconds oEmbed runs alone before the watch page is also requested
+TITLE_DEADLINE = 6.0  # seconds after which a pending title lookup is abandoned
+
+# On-disk cache for transcripts and titles, shared between runs
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "youtube-transcript-cli")
+CACHE_TTL = 24 * 60 * 60  # seconds
+use_disk_cache = True
+
+# Segment rebuilt from the disk cache; exposes the same fields we read from
+# youtube_transcript_api snippets
+CachedSegment = namedtuple('CachedSegment', 'text start duration')
+SEGMENT_FIELDS = operator.attrgetter(*CachedSegment._fields)
+
+def _cache_load(name):
+    """Return the cached JSON value stored under ``name``, or None if missing or expired."""
+    if not use_disk_cache:
+        return None
+    path = os.path.join(CACHE_DIR, f"{name}.json")
+    try:
+        if time.time() - os.path.getmtime(path) > CACHE_TTL:
+            return None
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _cache_store(name, value):
+    """Store ``value`` as JSON under ``name``; cache failures are never fatal."""
+    if not use_disk_cache:
+        return
+    path = os.path.join(CACHE_DIR, f"{name}.json")
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(value, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+@functools.lru_cache(maxsize=2048)
 def extract_video_id(url):
-    """Extrae el ID del video de YouTube desde varias formas de URL."""
-    for pattern in PATTERNS:
-        match = pattern.search(url)
-        if match and len(match.group(1)) == 11:
-            return match.group(1)
+    """Extrae el ID del video de YouTube desde varias formas de URL.
+
+    Las formas habituales (``watch?v=``, ``youtu.be/``, ``/embed/``...) se
+    resuelven con operaciones de cadena; solo las formas poco comunes
+    recurren al patrón completo. Un ID suelto de 11 caracteres se devuelve
+    tal cual y las cadenas que no mencionan un host de YouTube se descartan
+    sin analizarlas.
+    """
+    video_id_re, valid_id_re = _id_patterns()
+    # Cheap pre-checks: a bare ID, or something that can't be a YouTube URL
+    if len(url) == 11 and valid_id_re.fullmatch(url):
+        return url
+    if 'youtu' not in url.lower():
+        return None
+
+    parsed = urlparse(url)
+    if parsed.netloc.lower().endswith('youtu.be'):
+        candidate = parsed.path[1:12]
+        if valid_id_re.fullmatch(candidate):
+            return candidate
+
+    for candidate in parse_qs(parsed.query).get('v', ()):
+        if valid_id_re.fullmatch(candidate):
+            return candidate
+
+    path = parsed.path if parsed.netloc else url
+    for marker in ID_PATH_MARKERS:
+        i = path.find(marker)
+        if i >= 0:
+            start = i + len(marker)
+            candidate = path[start:start + 11]
+            if (valid_id_re.fullmatch(candidate)
+                    and path[start + 11:start + 12] in ('', '/', '?', '&', '#')):
+                return candidate
+
+    match = video_id_re.search(path)
+    if match:
+        return match.group(1)
     return None
 
+def clear_cache():
+    """Forget every cached title and transcript, in memory and on disk."""
+    _fetch_video_title.cache_clear()
+    try:
+        names = os.listdir(CACHE_DIR)
+    except OSError:
+        return
+    for name in names:
+        if name.endswith(".json"):
+            try:
+                os.remove(os.path.join(CACHE_DIR, name))
+            except OSError:
+                pass
+
 def get_transcript(video_id, language=None):
     """
-    Fetches the transcript for a video.
+    Fetches the transcript for a video, using the disk cache when possible.
     If a language is specified, it fetches that specific transcript.
     Otherwise, it prioritizes manual over generated transcripts.
     """
+    # Only plain language codes ('en', 'pt-BR', 'zh-Hans') become part of a
+    # cache file name; anything else (e.g. '../x') skips the disk cache
+    if language and not re.fullmatch(r'[A-Za-z0-9_-]+', language):
+        return _fetch_transcript(video_id, language)
+
+    cache_name = f"transcript-{video_id}-{language or 'auto'}"
+    cached = _cache_load(cache_name)
+    if cached is not None:
+        return list(map(CachedSegment._make, cached))
+
+    transcript = _fetch_transcript(video_id, language)
+    _cache_store(cache_name, list(map(SEGMENT_FIELDS, transcript)))
+    return transcript
+
+@functools.cache
+def get_transcript_api():
+    """Transcript API client that shares the pooled HTTP session."""
+    from youtube_transcript_api import YouTubeTranscriptApi
+
+    return YouTubeTranscriptApi(http_client=get_session())
+
+def _partition_languages(transcript_list):
+    """Split the available language codes into (manual, generated) in one pass."""
+    manual_langs = []
+    generated_langs = []
+    for t in transcript_list:
+        (generated_langs if t.is_generated else manual_langs).append(t.language_code)
+    return manual_langs, generated_langs
+
+def _fetch_transcript(video_id, language=None):
+    """Fetches the transcript for a video from YouTube."""
+    from youtube_transcript_api import TranscriptsDisabled, NoTranscriptFound
+
     try:
-        transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
+        transcript_list = get_transcript_api().list(video_id)
     except (TranscriptsDisabled, NoTranscriptFound):
         raise ValueError("No transcripts could be found for this video. They may be disabled.")
 
+    manual_langs, generated_langs = _partition_languages(transcript_list)
+    # A language can have both a manual and a generated track; list it once
+    available_langs = list(dict.fromkeys(manual_langs + generated_langs))
+
+    # One lookup over a single preference list: the requested language, or
+    # manual transcripts before generated ones
     if language:
-        try:
-            transcript = transcript_list.find_transcript([language])
-            return transcript.fetch()
-        except NoTranscriptFound:
-            available_langs = ", ".join([t.language_code for t in transcript_list])
-            raise ValueError(f"Language '{language}' not found. Available languages: {available_langs}")
-
-    # Prioritize manual transcripts
-    manual_langs = [t.language_code for t in transcript_list if not t.is_generated]
-    if manual_langs:
-        try:
-            return transcript_list.find_transcript(manual_langs).fetch()
-        except NoTranscriptFound:
-            # Fall through to generated transcripts if something goes wrong
-            pass
+        if language not in available_langs:
+            raise ValueError(
+                f"Language '{language}' not found. Available languages: {', '.join(available_langs)}")
+        preferred = [language]
+    else:
+        preferred = available_langs
 
-    # Fallback to any available transcript (usually auto-generated)
     try:
-        return transcript_list.find_transcript([t.language_code for t in transcript_list]).fetch()
+        return transcript_list.find_transcript(preferred).fetch()
     except NoTranscriptFound:
-        # This should be unreachable if the initial check passed, but is here for safety
         raise ValueError("No transcripts available for this video.")
 
+def _fetch_oembed_title(video_id):
+    """Fetch a video title from YouTube's oEmbed API."""
+    response = get_session().get(OEMBED_URL_TEMPLATE.format(video_id), timeout=5)
+    response.raise_for_status()
+    # Parse the raw bytes directly; json detects UTF-8 itself, skipping
+    # requests' charset guessing and the intermediate str
+    return json.loads(response.content).get('title', '')
+
+@functools.cache
+def _title_pattern():
+    """Compila el patrón del <title> en el primer uso."""
+    return re.compile(rb'<title[^>]*>(.*?)</title>', re.DOTALL | re.IGNORECASE)
+
+YOUTUBE_TITLE_SUFFIX = ' - YouTube'
+WATCH_PAGE_SCAN_LIMIT = 64 * 1024  # <title> sits in <head>, well before this
+
+def _scrape_watch_page_title(video_id):
+    """
+    Fallback: scrape the <title> tag from the watch page.
+    The page is streamed and reading stops as soon as the title has been
+    seen, instead of downloading the whole (~1 MB) document.
+    """
+    title_pattern = _title_pattern()
+    with get_session().get(WATCH_URL_TEMPLATE.format(video_id), timeout=5, stream=True) as response:
+        response.raise_for_status()
+        head = bytearray()
+        match = None
+        for chunk in response.iter_content(chunk_size=4096):
+            head += chunk
+            match = title_pattern.search(head)
+            if match or len(head) >= WATCH_PAGE_SCAN_LIMIT:
+                break
+    if not match:
+        raise ValueError("Watch page has no <title> tag")
+    title = html.unescape(match.group(1).decode('utf-8', errors='replace')).strip()
+    # Remove " - YouTube" suffix if present
+    if title.endswith(YOUTUBE_TITLE_SUFFIX):
+        title = title[:-len(YOUTUBE_TITLE_SUFFIX)]
+    return title
+
+def _submit_daemon(fn, *args):
+    """
+    Run ``fn(*args)`` on a daemon thread and return a Future for its result.
+    Unlike ThreadPoolExecutor workers, daemon threads are not joined at
+    interpreter exit, so an abandoned request never delays shutdown.
+    """
+    future = Future()
+
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, daemon=True).start()
+    return future
+
+def _fetch_title_hedged(video_id):
+    """
+    Ask oEmbed for the title and, if it is slow, the watch page as well.
+    oEmbed gets a ``TITLE_HEDGE_DELAY`` head start; if it has not answered
+    by then the watch page is requested too and the first successful
+    answer wins, so a slow oEmbed costs at most the faster of the two.
+    Both requests run on daemon threads, so the losing one is abandoned
+    rather than joined at exit and a single-URL CLI run ends as soon as
+    its transcript is saved.
+    """
+    oembed = _submit_daemon(_fetch_oembed_title, video_id)
+    try:
+        return oembed.result(timeout=TITLE_HEDGE_DELAY)
+    except FutureTimeoutError:
+        pass
+    except Exception:
+        # oEmbed failed outright; no point racing it
+        return _scrape_watch_page_title(video_id)
+
+    scrape = _submit_daemon(_scrape_watch_page_title, video_id)
+    error = None
+    for future in as_completed((oembed, scrape)):
+        try:
+            return future.result()
+        except Exception as e:
+            error = e
+    raise error
+
+@functools.lru_cache(maxsize=512)
+def _fetch_video_title(video_id):
+    """Fetch a video title, preferring oEmbed over scraping the watch page.
+
+    Raises on any failure so that only successful lookups are memoized.
+    """
+    cache_name = f"title-{video_id}"
+    cached = _cache_load(cache_name)
+    if cached is not None:
+        return cached
+
+    title = _fetch_title_hedged(video_id)
+    _cache_store(cache_name, title)
+    return title
+
 def get_video_title(url):
     """Extract video title from YouTube URL."""
     try:
         video_id = extract_video_id(url)
         if not video_id:
             return None
-        
-        # Use YouTube's oEmbed API to get video title
-        oembed_url = f"https://www.youtube.com/oembed?url=https://www.youtube.com/watch?v={video_id}&format=json"
-        response = requests.get(oembed_url, timeout=5)
-        
-        if response.status_code == 200:
-            data = response.json()
-            return data.get('title', '')
+        return _fetch_video_title(video_id)
     except Exception:
         pass
-    
+
     return None
 
-def format_transcript_to_markdown(transcript, url):
+def iter_markdown_parts(transcript, url, title):
+    """
+    Genera el documento Markdown pieza a pieza.
+    Primero la cabecera y la URL, después el texto de cada segmento
+    separado por un espacio, sin construir nunca el texto completo.
+    Args:
+        transcript: Lista de segmentos de transcripción.
+        url: URL original del video.
+        title: Título del video.
+    Yields:
+        str: Fragmentos consecutivos del documento.
+    """
+    yield f"# {title}\n\nURL: {url}\n\n"
+    separator = ""
+    for segment in transcript:
+        yield separator
+        yield segment.text
+        separator = " "
+
+def format_transcript_to_markdown(transcript, url, title=None):
     """
     Convierte la transcripción en formato Markdown.
     Args:
         transcript: Lista de segmentos de transcripción.
         url: URL original del video.
+        title: Título ya resuelto; si es None se consulta oEmbed.
     Returns:
         str: Contenido Markdown formateado.
     """
-    title = get_video_title(url) or "Video Transcript"
-    markdown_content = f"# {title}\n\nURL: {url}\n\n"
-    
-    # Concatenate all transcript segments into a single paragraph
-    transcript_text = " ".join(segment.text for segment in transcript)
-    markdown_content += transcript_text
-    
-    return markdown_content
+    if title is None:
+        title = get_video_title(url)
+    title = title or "Video Transcript"
+    return "".join(iter_markdown_parts(transcript, url, title))
 
-if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="Download YouTube video transcript.")
-    parser.add_argument("url", nargs="?", help="YouTube video URL")
-    parser.add_argument("-o", "--output", default="transcript.md", help="Output filename")
-    parser.add_argument("-l", "--language", help="Transcript language (e.g., 'en', 'es')")
+def write_transcript_markdown(path, transcript, url, title):
+    """
+    Write the transcript as Markdown straight to ``path``.
+    Each segment's text goes through a 1 MiB buffer as it is produced,
+    so memory use is bounded by one segment, not by the document.
+    """
+    with open(path, "w", encoding="utf-8", buffering=1 << 20) as f:
+        f.writelines(iter_markdown_parts(transcript, url, title))
 
-    args = parser.parse_args()
-    if args.url:
-        url = args.url
-    else:
-        url = input("Please enter the YouTube video URL: ")
+def fetch_transcript_and_title(video_id, url, language=None):
+    """
+    Descarga la transcripción y el título del video.
+    El título se consulta en un hilo aparte mientras se descarga la
+    transcripción, de modo que su latencia queda oculta tras ella.
+    Returns:
+        tuple: (transcript, title)
+    """
+    # On a daemon thread so an error is never held back (nor process exit
+    # delayed) waiting for the title request
+    deadline = time.monotonic() + TITLE_DEADLINE
+    title_future = _submit_daemon(get_video_title, url)
+    transcript = get_transcript(video_id, language)
+    try:
+        # A stalled title lookup must not hold back a finished transcript
+        title = title_future.result(timeout=max(0, deadline - time.monotonic()))
+    except FutureTimeoutError:
+        title = None
+    return transcript, title or "Video Transcript"
+
+def _fetch_one(url, language):
+    """Fetch transcript and title for one URL, returning the error instead of raising."""
+    try:
+        video_id = extract_video_id(url)
+        if not video_id:
+            raise ValueError("Could not extract video ID from the provided URL.")
+        return fetch_transcript_and_title(video_id, url, language)
+    except Exception as e:
+        return e
 
+def fetch_many_transcripts(urls, language=None, max_workers=8):
+    """
+    Descarga varias transcripciones en paralelo.
+    Las esperas de red se solapan en un pool de hilos acotado, así que un
+    lote tarda más o menos lo que sus videos más lentos, no la suma de todos.
+    Args:
+        urls: URLs de los videos.
+        language: Idioma de la transcripción (opcional).
+        max_workers: Número máximo de descargas simultáneas.
+    Yields:
+        tuple: (url, resultado) en el orden de entrada; el resultado es el
+        par ``(transcript, title)`` o la excepción lanzada para esa URL.
+    """
+    urls = list(urls)
+    if not urls:
+        return
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as executor:
+        results = executor.map(_fetch_one, urls, [language] * len(urls))
+        yield from zip(urls, results)
+
+def _run_batch(batch_file, output_dir, language=None):
+    """
+    Download every URL listed in ``batch_file`` concurrently.
+    Blank lines and lines starting with '#' are skipped. Each transcript is
+    saved as ``<video_id>.md`` in ``output_dir``. Returns the exit code:
+    non-zero if any URL failed.
+    """
+    try:
+        with open(batch_file, encoding="utf-8") as f:
+            urls = [line.strip() for line in f
+                    if line.strip() and not line.lstrip().startswith("#")]
+    except OSError as e:
+        print(f"Error: Could not read batch file: {e}")
+        return EXIT_ERROR
+
+    try:
+        os.makedirs(output_dir, exist_ok=True)
+    except OSError as e:
+        print(f"Error: Could not create output directory: {e}")
+        return EXIT_ERROR
+
+    failures = 0
+    for url, result in fetch_many_transcripts(urls, language):
+        try:
+            if isinstance(result, Exception):
+                raise result
+            transcript, title = result
+            path = os.path.join(output_dir, f"{extract_video_id(url)}.md")
+            write_transcript_markdown(path, transcript, url, title)
+            print(f"Transcript saved to {path}")
+        except Exception as e:
+            failures += 1
+            print(f"Error ({url}): {e}")
+    return EXIT_ERROR if failures else EXIT_OK
+
+def _run_single(url, output, language=None):
+    """Download one transcript to ``output`` and return the exit code."""
     # URL validation
     if not urlparse(url).scheme:
         print("Error: Invalid URL")
-        exit(1)
+        return EXIT_ERROR
 
     video_id = extract_video_id(url)
     if not video_id:
         print("Error: Could not extract video ID from the provided URL.")
-        exit(1)
+        return EXIT_ERROR
+
+    from youtube_transcript_api import TranscriptsDisabled, NoTranscriptFound
 
     try:
-        transcript = get_transcript(video_id, args.language)
-        markdown_content = format_transcript_to_markdown(transcript, url)
-        with open(args.output, "w", encoding="utf-8") as f:
-            f.write(markdown_content)
-        print(f"Transcript saved to {args.output}")
+        transcript, title = fetch_transcript_and_title(video_id, url, language)
+        write_transcript_markdown(output, transcript, url, title)
+        print(f"Transcript saved to {output}")
     except (ValueError, TranscriptsDisabled, NoTranscriptFound) as e:
         print(f"Error: {e}")
-        exit(1)
+        return EXIT_ERROR
     except Exception as e:
         print(f"An unexpected error occurred: {e}")
-        exit(1)
+        return EXIT_ERROR
+    return EXIT_OK
+
+@functools.lru_cache(maxsize=1)
+def build_parser():
+    """Construye (una sola vez) el parser de argumentos de la CLI."""
+    # Imported here: the desktop app imports this module but never parses args
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Download YouTube video transcript.")
+    parser.add_argument("url", nargs="?", help="YouTube video URL")
+    parser.add_argument("-o", "--output",
+                        help="Output filename (default: transcript.md); with --batch, the output directory")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="Download every URL listed in FILE (one per line) concurrently")
+    parser.add_argument("-l", "--language", help="Transcript language (e.g., 'en', 'es')")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the on-disk transcript/title cache")
+    parser.add_argument("--clear-cache", action="store_true", help="Delete cached transcripts and titles")
+    return parser
+
+def main(argv=None):
+    """
+    CLI entry point.
+    Returns the process exit code: EXIT_OK on success, EXIT_ERROR when the
+    URL is invalid or a download fails, EXIT_USAGE when no URL can be read.
+    argparse itself exits with status 2 on bad arguments.
+    """
+    global use_disk_cache
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.batch and args.url:
+        parser.error("a URL cannot be combined with --batch; list it in the batch file")
+    if args.clear_cache:
+        clear_cache()
+        if not args.url and not args.batch:
+            print("Cache cleared")
+            return EXIT_OK
+    if args.batch:
+        url = None
+    elif args.url:
+        url = args.url
+    elif sys.stdin.isatty():
+        url = input("Please enter the YouTube video URL: ").strip()
+    else:
+        # Piped input (e.g. `echo URL | app.py`): read one line, no prompt
+        url = sys.stdin.readline().strip()
+        if not url:
+            print("Error: No URL given on the command line or stdin")
+            return EXIT_USAGE
+
+    # --no-cache applies to this run only; later calls in the same process
+    # (or a library caller) get the disk cache back
+    previous_use_disk_cache = use_disk_cache
+    if args.no_cache:
+        use_disk_cache = False
+    try:
+        if args.batch:
+            return _run_batch(args.batch, args.output or ".", args.language)
+        return _run_single(url, args.output or "transcript.md", args.language)
+    finally:
+        use_disk_cache = previous_use_disk_cache
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,59 +1,87 @@
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox, scrolledtext
+from tkinter import ttk, scrolledtext
 from tkinter import font as tkfont
 import threading
+import queue
 import os
-import glob
-import platform
-import ctypes
-from youtube_transcript_api import YouTubeTranscriptApi, TranscriptsDisabled, NoTranscriptFound
+import sys
 from urllib.parse import urlparse
-import re
-import requests
-from bs4 import BeautifulSoup
 
 # Import functions from the original app
-from app import extract_video_id, get_transcript, format_transcript_to_markdown
+from app import (extract_video_id, fetch_transcript_and_title, format_transcript_to_markdown,
+                 write_transcript_markdown, clear_cache)
 
 
-def load_private_fonts(font_dir: str) -> None:
+# Characters per insert when filling the preview
+PREVIEW_CHUNK_SIZE = 8192
+
+# Bundled fonts, resolved once at import
+FONTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets', 'fonts')
+
+# Installed font families, enumerated once per process (see get_font_families)
+_font_families = None
+
+
+def get_font_families(root) -> frozenset:
+    """Return the available font families, asking Tk only on the first call.
+
+    Enumerating families is a Tcl round-trip over every installed font,
+    which can be thousands on Windows.
+    """
+    global _font_families
+    if _font_families is None:
+        _font_families = frozenset(tkfont.families(root))
+    return _font_families
+
+
+def load_private_fonts(font_dir: str) -> bool:
     """Load TTF/OTF fonts privately for this process on Windows.
 
     Fonts added with FR_PRIVATE are visible only to the current process,
     which is ideal for bundling fonts with the app without installing system-wide.
+    Returns True if at least one font was added.
     """
+    global _font_families
     try:
-        if platform.system() != 'Windows':
-            return
+        if sys.platform != 'win32':
+            return False
+        # Only needed on Windows, so not imported at module level
+        import ctypes
+        from ctypes import wintypes
+
         if not font_dir or not os.path.isdir(font_dir):
-            return
-        font_paths = []
-        font_paths.extend(glob.glob(os.path.join(font_dir, "*.ttf")))
-        font_paths.extend(glob.glob(os.path.join(font_dir, "*.otf")))
+            return False
+        # One directory pass instead of a glob per extension
+        with os.scandir(font_dir) as entries:
+            font_paths = [entry.path for entry in entries
+                          if entry.name.lower().endswith(('.ttf', '.otf')) and entry.is_file()]
         if not font_paths:
-            return
+            return False
         FR_PRIVATE = 0x10
+        # Declare the signature once so ctypes doesn't infer it per call
+        add_font_resource = ctypes.windll.gdi32.AddFontResourceExW
+        add_font_resource.argtypes = (
+            wintypes.LPCWSTR, wintypes.DWORD, wintypes.LPVOID)
+        add_font_resource.restype = ctypes.c_int
         added_any = False
         for font_path in font_paths:
             try:
-                res = ctypes.windll.gdi32.AddFontResourceExW(
-                    str(font_path), FR_PRIVATE, 0)
+                res = add_font_resource(font_path, FR_PRIVATE, None)
                 if res > 0:
                     added_any = True
             except Exception:
                 # Ignore failures for individual files
                 pass
+        # No WM_FONTCHANGE broadcast: FR_PRIVATE fonts are invisible to other
+        # processes, and broadcasting could block for up to a second on
+        # unresponsive top-level windows.
         if added_any:
-            try:
-                HWND_BROADCAST = 0xFFFF
-                WM_FONTCHANGE = 0x001D
-                ctypes.windll.user32.SendMessageTimeoutW(
-                    HWND_BROADCAST, WM_FONTCHANGE, 0, 0, 0, 1000, None)
-            except Exception:
-                pass
+            # New families are available; drop any stale enumeration
+            _font_families = None
+        return added_any
     except Exception:
         # Silently ignore font loading issues; app will fall back to system fonts
-        pass
+        return False
 
 
 class YouTubeTranscriptGUI:
@@ -67,10 +95,23 @@ class YouTubeTranscriptGUI:
         self.url_var = tk.StringVar()
         self.output_var = tk.StringVar(value="youtube_transcript")
         self.status_var = tk.StringVar(value="Ready")
+        self._last_status = "Ready"
+        self._status_error = False
         self.current_transcript = None
+        self.current_title = None
         self.current_url = None
+        self._preview_generation = 0
+        self._loading = False
+
+        # Single long-lived daemon worker: fetches queue up instead of piling
+        # up threads, and closing the window never waits for one to finish
+        self._fetch_queue = queue.Queue()
+        threading.Thread(target=self._fetch_loop, name='ytt-fetch',
+                         daemon=True).start()
+        self.root.protocol('WM_DELETE_WINDOW', self._on_close)
 
         self._setup_style()
+        self._setup_menu()
         self.setup_ui()
         self._setup_shortcuts()
 
@@ -163,6 +204,10 @@ class YouTubeTranscriptGUI:
                            sticky=(tk.W, tk.E), pady=(0, 6))
         self.progress.grid_remove()
 
+        # Widgets locked while a fetch is running
+        self._toggle_widgets = (
+            self.fetch_button, self.url_entry, self.output_entry)
+
         # Preview label
         preview_label = ttk.Label(
             card, text="Preview", style='Section.TLabel')
@@ -184,6 +229,9 @@ class YouTubeTranscriptGUI:
             padx=12,
             pady=12,
             undo=False,
+            # Append-only preview: keep no undo history at all
+            autoseparators=False,
+            maxundo=0,
         )
         self.preview_text.grid(row=0, column=0, sticky=(
             tk.W, tk.E, tk.N, tk.S))
@@ -199,62 +247,47 @@ class YouTubeTranscriptGUI:
             status_frame, textvariable=self.status_var, anchor=tk.W, style='Status.TLabel')
         self.status_label.grid(row=0, column=0, sticky=(tk.W, tk.E))
 
-    def get_video_title(self, url):
-        """Extract video title from YouTube URL."""
-        try:
-            video_id = extract_video_id(url)
-            if not video_id:
-                return None
-
-            # Use YouTube's oEmbed API to get video title
-            oembed_url = f"https://www.youtube.com/oembed?url=https://www.youtube.com/watch?v={video_id}&format=json"
-            response = requests.get(oembed_url, timeout=5)
-
-            if response.status_code == 200:
-                data = response.json()
-                return data.get('title', '')
-
-        except Exception:
-            # Fallback: try to scrape title from page
-            try:
-                response = requests.get(url, timeout=5)
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    title_tag = soup.find('title')
-                    if title_tag:
-                        title = title_tag.text.strip()
-                        # Remove " - YouTube" suffix if present
-                        if title.endswith(' - YouTube'):
-                            title = title[:-10]
-                        return title
-            except Exception:
-                pass
+    def _setup_menu(self):
+        menubar = tk.Menu(self.root)
+        cache_menu = tk.Menu(menubar, tearoff=False)
+        cache_menu.add_command(label="Clear Cached Transcripts",
+                               command=self.clear_cached_transcripts)
+        menubar.add_cascade(label="Cache", menu=cache_menu)
+        self.root.configure(menu=menubar)
 
-        return None
+    def clear_cached_transcripts(self):
+        try:
+            clear_cache()
+            self._set_status("Cache cleared")
+        except Exception as e:
+            # Dialogs are only needed on failure; load them on demand
+            from tkinter import messagebox
+            messagebox.showerror("Error", f"Failed to clear cache: {e}")
 
     def clear_fields(self):
         self.url_var.set("")
         self.output_var.set("youtube_transcript")
+        self._preview_generation += 1  # Cancel any preview still streaming in
         self.preview_text.delete(1.0, tk.END)
-        self.status_var.set("Ready")
+        self._set_status("Ready")
         self.current_transcript = None
+        self.current_title = None
         self.current_url = None
         self.download_button.config(state='disabled')
 
     def validate_url(self):
         url = self.url_var.get().strip()
         if not url:
-            messagebox.showerror("Error", "Please enter a YouTube URL")
+            self._show_error("Please enter a YouTube URL")
             return False
 
         if not urlparse(url).scheme:
-            messagebox.showerror("Error", "Invalid URL format")
+            self._show_error("Invalid URL format")
             return False
 
         video_id = extract_video_id(url)
         if not video_id:
-            messagebox.showerror(
-                "Error", "Could not extract video ID from the provided URL")
+            self._show_error("Could not extract video ID from the provided URL")
             return False
 
         return True
@@ -262,32 +295,36 @@ class YouTubeTranscriptGUI:
     def validate_filename(self):
         output_file = self.output_var.get().strip()
         if not output_file:
-            messagebox.showerror("Error", "Please specify a filename")
+            self._show_error("Please specify a filename")
             return False
         return True
 
     def fetch_transcript(self):
+        # Enter is bound on the root window; ignore it while a fetch runs
+        if self._loading:
+            return
         if not self.validate_url():
             return
 
         # Disable button and update status
         self._set_loading(True)
-        self.status_var.set("Fetching transcript...")
+        self._set_status("Fetching transcript...")
 
-        # Run fetch in separate thread
-        thread = threading.Thread(target=self._fetch_worker)
-        thread.daemon = True
-        thread.start()
+        # Run fetch on the background worker
+        self._fetch_queue.put(self.url_var.get().strip())
 
     def download_transcript(self):
         if not self.validate_filename():
             return
 
         if not self.current_transcript:
-            messagebox.showerror(
-                "Error", "No transcript available. Please fetch transcript first.")
+            self._show_error(
+                "No transcript available. Please fetch transcript first.")
             return
 
+        # Loaded on first save; most sessions never open the dialog
+        from tkinter import filedialog
+
         # Open file dialog to choose save location
         filename = self.output_var.get().strip()
         if not filename.endswith('.md'):
@@ -301,25 +338,47 @@ class YouTubeTranscriptGUI:
 
         if save_path:
             try:
-                with open(save_path, "w", encoding="utf-8") as f:
-                    f.write(self.current_transcript)
+                # Stream the document from the fetched segments instead of
+                # encoding the whole preview string in one go
+                write_transcript_markdown(save_path, self.current_transcript,
+                                          self.current_url, self.current_title)
 
-                self.status_var.set(f"Transcript saved to {save_path}")
-                messagebox.showinfo(
-                    "Success", f"Transcript successfully saved to {save_path}")
+                # Confirm in the status bar rather than a modal dialog
+                self._set_status(f"Transcript saved to {save_path}")
             except Exception as e:
+                from tkinter import messagebox
                 messagebox.showerror("Error", f"Failed to save file: {e}")
 
-    def _fetch_worker(self):
+    def _fetch_loop(self):
+        while True:
+            url = self._fetch_queue.get()
+            if url is None:
+                return
+            try:
+                self._fetch_worker(url)
+            except (RuntimeError, tk.TclError):
+                # The window was closed while this fetch was running
+                return
+
+    def _fetch_worker(self, url):
         try:
-            url = self.url_var.get().strip()
+            # Deferred so the window paints before the network libraries load
+            from youtube_transcript_api import TranscriptsDisabled, NoTranscriptFound
+        except ImportError as e:
+            # Surface a missing dependency instead of leaving the UI loading
+            self.root.after(
+                0, self._fetch_error, f"An unexpected error occurred: {e}")
+            return
 
+        try:
             video_id = extract_video_id(url)
-            transcript = get_transcript(video_id, None)  # No language specified
-            markdown_content = format_transcript_to_markdown(transcript, url)
+            transcript, title = fetch_transcript_and_title(
+                video_id, url, None)  # No language specified
+            markdown_content = format_transcript_to_markdown(transcript, url, title)
 
             # Update UI in main thread
-            self.root.after(0, self._fetch_success, markdown_content, url)
+            self.root.after(0, self._fetch_success, markdown_content, url,
+                            transcript, title)
 
         except (ValueError, TranscriptsDisabled, NoTranscriptFound) as e:
             self.root.after(0, self._fetch_error, str(e))
@@ -327,44 +386,86 @@ class YouTubeTranscriptGUI:
             self.root.after(
                 0, self._fetch_error, f"An unexpected error occurred: {e}")
 
-    def _fetch_success(self, content, url):
+    def _fetch_success(self, content, url, transcript, title):
         self._set_loading(False)
         self.download_button.config(state='normal')
-        self.status_var.set("Transcript fetched successfully")
+        self._set_status("Transcript fetched successfully")
 
-        # Store transcript and URL for later download
-        self.current_transcript = content
+        # Store transcript, title and URL for later download
+        self.current_transcript = transcript
+        self.current_title = title
         self.current_url = url
 
-        # Show preview
+        self._show_preview(content)
+
+    def _show_preview(self, content):
+        """Replace the preview text, streaming it in chunks.
+
+        The first chunk is inserted right away and the rest from idle
+        callbacks, so the window repaints and stays responsive while a
+        long transcript fills in. A newer preview or Clear drops any
+        chunks still pending.
+        """
+        self._preview_generation += 1
         self.preview_text.delete(1.0, tk.END)
-        self.preview_text.insert(1.0, content)
+        self._insert_preview_chunk(content, 0, self._preview_generation)
+
+    def _insert_preview_chunk(self, content, start, generation):
+        if generation != self._preview_generation:
+            return
+        end = start + PREVIEW_CHUNK_SIZE
+        self.preview_text.insert(tk.END, content[start:end])
+        if end < len(content):
+            self.root.after_idle(
+                self._insert_preview_chunk, content, end, generation)
 
     def _fetch_error(self, error_message):
         self._set_loading(False)
-        self.status_var.set("Error fetching transcript")
-        messagebox.showerror("Error", error_message)
+        self._show_error(error_message)
+
+    def _show_error(self, message):
+        # Recoverable errors go to the status bar instead of a modal dialog
+        self._set_status(f"Error: {message}", error=True)
+
+    def _set_status(self, message, error=False):
+        # Only touch the Tk variable (and label style) when something changes
+        if message != self._last_status:
+            self.status_var.set(message)
+            self._last_status = message
+        if error != self._status_error:
+            self.status_label.config(
+                style='StatusError.TLabel' if error else 'Status.TLabel')
+            self._status_error = error
 
     def _set_loading(self, is_loading: bool):
+        # Nothing to do if the state isn't changing
+        if is_loading == self._loading:
+            return
+        self._loading = is_loading
+
+        state = 'disabled' if is_loading else 'normal'
+        for widget in self._toggle_widgets:
+            widget.config(state=state)
+
         if is_loading:
-            self.fetch_button.config(state='disabled')
-            self.url_entry.config(state='disabled')
-            self.output_entry.config(state='disabled')
             self.progress.grid()
             try:
                 self.progress.start(10)
             except Exception:
                 pass
         else:
-            self.fetch_button.config(state='normal')
-            self.url_entry.config(state='normal')
-            self.output_entry.config(state='normal')
             try:
                 self.progress.stop()
             except Exception:
                 pass
             self.progress.grid_remove()
 
+    def _on_close(self):
+        # Stop the worker after its current fetch; being a daemon thread, it
+        # never holds up process exit while a request is still in flight
+        self._fetch_queue.put(None)
+        self.root.destroy()
+
     def _setup_shortcuts(self):
         # Enter to fetch when focus in entries
         self.root.bind('<Return>', lambda e: self.fetch_transcript())
@@ -384,12 +485,13 @@ class YouTubeTranscriptGUI:
             'primary': '#2563EB',
             'primary_hover': '#1D4ED8',
             'editor_bg': '#FAFAFA',
+            'error': '#DC2626',
         }
 
         self.root.configure(bg=self.colors['bg'])
 
         # Resolve available font families (prefer private ones if loaded)
-        families = set(tkfont.families(self.root))
+        families = get_font_families(self.root)
 
         def pick_font(preferred_list, default_name):
             for name in preferred_list:
@@ -406,6 +508,7 @@ class YouTubeTranscriptGUI:
         self.font_base = (base_family, 10)
         self.font_title = (base_family, 18, 'bold')
         self.font_subtitle = (base_family, 11)
+        self.font_section = ('Segoe UI', 11, 'bold')
         self.font_status = (base_family, 9)
         self.font_mono = (base_family, 10)
 
@@ -430,59 +533,63 @@ class YouTubeTranscriptGUI:
         except Exception:
             pass
 
-        # General styles
-        style.configure('App.TFrame', background=self.colors['bg'])
-        style.configure('Card.TFrame', background=self.colors['card'])
-        style.configure('CardInner.TFrame',
-                        background=self.colors['card'])
-
-        style.configure('TLabel', background=self.colors['card'],
-                        foreground=self.colors['text'], font=self.font_base)
-        style.configure('Label.TLabel', background=self.colors['card'],
-                        foreground=self.colors['muted'], font=self.font_base)
-        style.configure('Section.TLabel', background=self.colors['card'], foreground=self.colors['text'],
-                        font=('Segoe UI', 11, 'bold'))
-
-        style.configure('Input.TEntry', padding=8)
-
-        # Header styles
-        style.configure('Header.TFrame', background=self.colors['header_bg'])
-        style.configure('Header.TLabel', background=self.colors['header_bg'],
-                        foreground=self.colors['header_text'], font=self.font_title)
-        style.configure('HeaderSub.TLabel', background=self.colors['header_bg'], foreground='#D1D5DB',
-                        font=self.font_subtitle)
+        # All ttk styles as one table, applied in a single pass
+        colors = self.colors
+        styles = (
+            # General styles
+            ('App.TFrame', {'background': colors['bg']}),
+            ('Card.TFrame', {'background': colors['card']}),
+            ('CardInner.TFrame', {'background': colors['card']}),
+            ('TLabel', {'background': colors['card'], 'foreground': colors['text'],
+                        'font': self.font_base}),
+            ('Label.TLabel', {'background': colors['card'], 'foreground': colors['muted'],
+                              'font': self.font_base}),
+            ('Section.TLabel', {'background': colors['card'], 'foreground': colors['text'],
+                                'font': self.font_section}),
+            ('Input.TEntry', {'padding': 8}),
+            # Header styles
+            ('Header.TFrame', {'background': colors['header_bg']}),
+            ('Header.TLabel', {'background': colors['header_bg'], 'foreground': colors['header_text'],
+                               'font': self.font_title}),
+            ('HeaderSub.TLabel', {'background': colors['header_bg'], 'foreground': '#D1D5DB',
+                                  'font': self.font_subtitle}),
+            # Buttons
+            ('Primary.TButton', {'font': self.font_base, 'padding': 8}),
+            ('Secondary.TButton', {'font': self.font_base, 'padding': 8}),
+            ('Accent.TButton', {'font': self.font_base, 'padding': 8, 'foreground': 'white',
+                                'background': colors['primary']}),
+            # Status bar
+            ('Status.TFrame', {'background': colors['bg']}),
+            ('Status.TLabel', {'background': colors['bg'], 'foreground': colors['muted'],
+                               'font': self.font_status}),
+            ('StatusError.TLabel', {'background': colors['bg'], 'foreground': colors['error'],
+                                    'font': self.font_status}),
+            # Progressbar
+            ('Thin.Horizontal.TProgressbar', {'thickness': 6, 'background': colors['primary'],
+                                              'troughcolor': colors['border'],
+                                              'bordercolor': colors['border']}),
+        )
+        for name, options in styles:
+            style.configure(name, **options)
 
-        # Buttons
-        style.configure('Primary.TButton', font=self.font_base, padding=8)
-        style.configure('Secondary.TButton', font=self.font_base, padding=8)
-        style.configure('Accent.TButton', font=self.font_base,
-                        padding=8, foreground='white', background=self.colors['primary'])
         style.map('Accent.TButton',
-                  background=[('active', self.colors['primary_hover']),
-                              ('!disabled', self.colors['primary'])],
+                  background=[('active', colors['primary_hover']),
+                              ('!disabled', colors['primary'])],
                   foreground=[('!disabled', 'white')])
 
-        # Status bar
-        style.configure('Status.TFrame', background=self.colors['bg'])
-        style.configure('Status.TLabel', background=self.colors['bg'],
-                        foreground=self.colors['muted'], font=self.font_status)
-
-        # Progressbar
-        style.configure(
-            'Thin.Horizontal.TProgressbar',
-            thickness=6,
-            background=self.colors['primary'],
-            troughcolor=self.colors['border'],
-            bordercolor=self.colors['border']
-        )
-
-
 def main():
-    # Load bundled fonts privately (Windows only)
-    fonts_dir = os.path.join(os.path.dirname(__file__), 'assets', 'fonts')
-    load_private_fonts(fonts_dir)
+    # Load bundled fonts privately (Windows only), overlapping with Tk start-up;
+    # the GUI picks its font family, so wait for the loader before building it
+    # (no thread at all off Windows or when the fonts aren't bundled)
+    font_loader = None
+    if sys.platform == 'win32' and os.path.isdir(FONTS_DIR):
+        font_loader = threading.Thread(
+            target=load_private_fonts, args=(FONTS_DIR,), daemon=True)
+        font_loader.start()
 
     root = tk.Tk()
+    if font_loader is not None:
+        font_loader.join()
     app = YouTubeTranscriptGUI(root)
     root.mainloop()
 
@@ -29,7 +29,6 @@ echo Checking required Python libraries...
 set "NEED_INSTALL=0"
 call :check_module youtube_transcript_api || set "NEED_INSTALL=1"
 call :check_module requests || set "NEED_INSTALL=1"
-call :check_module bs4 || set "NEED_INSTALL=1"
 
 if "%NEED_INSTALL%"=="0" (
     echo All required libraries are already installed.
@@ -41,9 +40,8 @@ echo.
 
 REM Show dependencies and ask for confirmation
 echo The following Python libraries will be installed:
-echo - youtube-transcript-api ^(^>=0.6.0^)
+echo - youtube-transcript-api ^(^>=1.0.0^)
 echo - requests ^(^>=2.25.0^)
-echo - beautifulsoup4 ^(^>=4.9.0^)
 echo.
 set /p install_choice="Do you want to install these libraries? (Y/N): "
 